@@ -11,9 +11,11 @@ Simple Agent Example
 
 Demonstrates the most basic PydanticAI agent setup with a single prompt.
 Shows how to create an agent with instructions and run it synchronously.
+Replies are cached on disk per model, instructions and prompt, so re-running skips the LLM call.
 """
 
 import os
+import shelve
 
 from dotenv import load_dotenv
 from pydantic_ai import Agent
@@ -22,10 +24,26 @@ from pydantic_ai import Agent
 load_dotenv(override=True)
 
 model = os.getenv("MODEL")
+instructions = "Be concise, reply with one sentence."
+prompt = "What character says 'hello there'?"
+
+# Request latency-optimized inference on Bedrock; the Bedrock settings import boto3, so only load them there
+if model and model.startswith("bedrock:"):
+    from pydantic_ai.models.bedrock import BedrockModelSettings
+
+    model_settings = BedrockModelSettings(bedrock_performance_configuration={"latency": "optimized"})
+else:
+    model_settings = None
 
 # Create a simple agent with the configured model
-agent = Agent(model, instructions="Be concise, reply with one sentence.")
+agent = Agent(model, instructions=instructions, model_settings=model_settings)
+
+# Reuse the reply from a previous run with the same model, instructions and prompt
+with shelve.open(".agent_cache") as cache:
+    cache_key = f"{model}\n{instructions}\n{prompt}"
+    if cache_key not in cache:
+        # Run the agent synchronously with a simple prompt
+        result = agent.run_sync(prompt)
+        cache[cache_key] = result.output
 
-# Run the agent synchronously with a simple prompt
-result = agent.run_sync("What character says 'hello there'?")
-print(result.output)
+    print(cache[cache_key])
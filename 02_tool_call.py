@@ -12,6 +12,7 @@ Tool Definition Example
 Demonstrates how to define tools using @agent.tool_plain decorator.
 Tools are functions that agents can call to perform actions.
 This example shows a simple dice rolling tool that returns plain Python types.
+The reply is printed as it streams in, while the agent still runs its tool calls to completion.
 """
 
 import os
@@ -19,14 +20,24 @@ import random
 
 from dotenv import load_dotenv
 from pydantic_ai import Agent
+from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
 
+# Request latency-optimized inference on Bedrock; the Bedrock settings import boto3, so only load them there
+if model and model.startswith("bedrock:"):
+    from pydantic_ai.models.bedrock import BedrockModelSettings
+
+    model_settings = BedrockModelSettings(bedrock_performance_configuration={"latency": "optimized"})
+else:
+    model_settings = None
+
 # Create an agent with a system prompt
 agent = Agent(
     model,
     system_prompt="You're a helpful assistant that can roll dice for the user.",
+    model_settings=model_settings,
 )
 
 
@@ -38,6 +49,16 @@ def roll_die(sides: int = 6) -> str:
     return f"Rolled a {sides}-sided die: {result}"
 
 
+# run_stream would stop at the first text part and skip the tool call, so stream the run's events instead
+async def print_text(ctx, events):
+    """Print the model's text as it arrives."""
+    async for event in events:
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            print(event.part.content, end="", flush=True)
+        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+            print(event.delta.content_delta, end="", flush=True)
+
+
 # Run the agent with a user prompt
-result = agent.run_sync("Roll a 20-sided die for me")
-print(result.output)
+agent.run_sync("Roll a 20-sided die for me", event_stream_handler=print_text)
+print()
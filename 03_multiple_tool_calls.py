@@ -4,7 +4,9 @@
 # dependencies = [
 #   "pydantic-ai==1.1.0",
 #   "python-dotenv==1.1.1",
-#   "httpx==0.28.1",
+#   "httpx[http2]==0.28.1",
+#   "orjson==3.11.3",
+#   "diskcache==5.6.3",
 # ]
 # ///
 """
@@ -12,62 +14,159 @@ Multiple Tool Calls
 
 Demonstrates an agent using multiple tools to answer a complex question.
 Shows how the agent can call different tools to gather information and synthesize
-a comprehensive answer. Features real weather API integration with Logfire observability.
+a comprehensive answer. Features real weather API integration with optional Logfire observability.
+The tools are async and share one HTTP client, and a batch tool fetches several cities in a
+single tool call so the model needs fewer round-trips. Results are cached on disk for five minutes.
+The answer is printed as it streams in.
 """
 
+import asyncio
 import os
+from textwrap import dedent
+from urllib.parse import quote
 
 import httpx
-import logfire
+import orjson
+from diskcache import Cache
 from dotenv import load_dotenv
 from pydantic_ai import Agent
+from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
 
 # Load environment variables from .env file
 load_dotenv(override=True)
 
 model = os.getenv("MODEL")
 
-# Configure Logfire for local development (no sending to the cloud)
-logfire.configure(send_to_logfire=False)
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+logfire_enabled = os.getenv("LOGFIRE_ENABLED") == "1"
+if logfire_enabled:
+    import logfire
 
-# Instrument PydanticAI to track all agent operations
-logfire.instrument_pydantic_ai()
+    # Configure Logfire for local development (no sending to the cloud)
+    logfire.configure(send_to_logfire=False)
+
+    # Instrument PydanticAI to track all agent operations
+    logfire.instrument_pydantic_ai()
+    log = logfire
+else:
+
+    class NoLog:
+        """Stand-in for logfire that ignores every logging call."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    log = NoLog()
+
+# One shared HTTP/2 client for every tool call, so concurrent requests to wttr.in share a pooled connection
+http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    http2=True,
+)
+
+# City names are URL-encoded so names like "São Paulo" or "Cairo (Egypt)" form a valid path
+WTTR_URL = "https://wttr.in/{}?format=j1"
+
+# Keep each city's temperature on disk for 5 minutes so re-running the script skips the HTTP calls;
+# 04 caches a different shape of data, so it gets its own directory
+weather_cache = Cache(".temperature_cache")
+
+# Request latency-optimized inference on Bedrock; the Bedrock settings import boto3, so only load them there
+if model and model.startswith("bedrock:"):
+    from pydantic_ai.models.bedrock import BedrockModelSettings
+
+    model_settings = BedrockModelSettings(bedrock_performance_configuration={"latency": "optimized"})
+else:
+    model_settings = None
 
 # Create a weather agent with multiple tools
 agent = Agent(
     model,
-    system_prompt="You're a helpful weather assistant. Use the available tools to answer questions about weather.",
+    system_prompt=dedent(
+        """
+        You're a helpful weather assistant. Use the available tools to answer questions about weather.
+        When asked about multiple cities, call get_weather_batch once with the full list
+        rather than calling get_weather for each city.
+        """
+    ).strip(),
+    model_settings=model_settings,
     instrument=True,
 )
 
 
 @agent.tool_plain
-def get_weather(city: str) -> str:
+async def get_weather(city: str) -> str:
     """Fetch current temperature for a specific city from wttr.in API."""
+    cache_key = city.casefold().strip()
+    if (cached := weather_cache.get(cache_key)) is not None:
+        log.info("Weather cache hit", city=city)
+        return cached
+
+    url = WTTR_URL.format(quote(city, safe=""))
+    log.info("Fetching weather for {city}", city=city)
+
+    # Only the network call and JSON decoding are expected to fail (orjson.JSONDecodeError is a ValueError)
     try:
-        url = f"https://wttr.in/{city}?format=j1"
-        logfire.info(f"Fetching weather for {city}")
+        response = await http_client.get(url)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+    except (httpx.HTTPError, ValueError) as e:
+        log.error("Weather fetch failed for {city}: {error}", city=city, error=str(e))
+        return f"Unable to fetch weather for {city}"
 
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            data = response.json()
+    # A 200 response can still be missing the fields we read, so report it like a failed fetch
+    try:
+        temp_f = data["current_condition"][0]["temp_F"]
+    except (KeyError, IndexError, TypeError) as e:
+        log.error("Unexpected weather payload for {city}: {error}", city=city, error=repr(e))
+        return f"Unable to fetch weather for {city}"
 
-        current = data["current_condition"][0]
-        temp_f = current["temp_F"]
+    result = f"{city} is currently {temp_f}°F"
+    log.info("Weather retrieved: {city} = {temp_f}°F", city=city, temp_f=temp_f)
+    weather_cache.set(cache_key, result, expire=300)
+    return result
 
-        result = f"{city} is currently {temp_f}°F"
-        logfire.info(f"Weather retrieved: {city} = {temp_f}°F")
-        return result
 
-    except Exception as e:
-        logfire.error(f"Weather fetch failed for {city}: {e}")
-        return f"Unable to fetch weather for {city}"
+@agent.tool_plain
+async def get_weather_batch(cities: list[str]) -> dict[str, str]:
+    """Fetch current temperatures for several cities at once from wttr.in API."""
+    results = await asyncio.gather(*(get_weather(city) for city in cities))
+    return dict(zip(cities, results))
+
+
+async def warm_up_connection():
+    """Open a connection to wttr.in while the model is still planning its first tool call."""
+    try:
+        await http_client.head("https://wttr.in/", timeout=5.0)
+    except httpx.HTTPError:
+        pass  # Only an optimization; get_weather reports real connection problems
+
+
+# run_stream would stop at the first text part and skip the tool calls, so stream the run's events instead
+async def print_text(ctx, events):
+    """Print the model's text as it arrives."""
+    async for event in events:
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            print(event.part.content, end="", flush=True)
+        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+            print(event.delta.content_delta, end="", flush=True)
+
+
+async def main():
+    print()
+    print("=" * 70)
+    print("🤖 Agent Response:\n")
+
+    # Close the shared client once the agent run is finished
+    async with http_client:
+        warm_up = asyncio.create_task(warm_up_connection())
+        await agent.run(
+            "What's the temperature in Tokyo, Sydney, and London right now?", event_stream_handler=print_text
+        )
+        await warm_up
 
+    print("\n")
 
-result = agent.run_sync("What's the temperature in Tokyo, Sydney, and London right now?")
 
-print()
-print("=" * 70)
-print(f"🤖 Agent Response:\n\n{result.output}")
-print()
+asyncio.run(main())
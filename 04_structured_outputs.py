@@ -4,7 +4,8 @@
 # dependencies = [
 #   "pydantic-ai==1.1.0",
 #   "python-dotenv==1.1.1",
-#   "httpx==0.28.1",
+#   "httpx[http2]==0.28.1",
+#   "diskcache==5.6.3",
 #   "rich==14.2.0",
 # ]
 # ///
@@ -15,23 +16,75 @@ Demonstrates structured output using Pydantic models combined with Rich table vi
 The agent fetches real weather data for multiple cities worldwide using wttr.in API,
 returns typed WeatherReport objects, and displays results in a beautiful formatted table.
 Shows how to combine type-safe outputs with professional data presentation.
+The weather tool is async, takes the whole list of cities, and fetches them concurrently
+over one shared HTTP client, so the model needs a single tool call. Results are cached on disk for ten minutes.
 """
 
+import asyncio
 import os
+from operator import attrgetter, itemgetter
 from textwrap import dedent
+from types import MappingProxyType
+from typing import Any
+from urllib.parse import quote
 
 import httpx
-import logfire
+from diskcache import Cache
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationInfo, model_validator
 from pydantic_ai import Agent
 from rich.console import Console
 from rich.table import Table
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+logfire_enabled = os.getenv("LOGFIRE_ENABLED") == "1"
+if logfire_enabled:
+    import logfire
+
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
+    log = logfire
+else:
+
+    class NoLog:
+        """Stand-in for logfire that ignores every logging call."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    log = NoLog()
+
+# One shared HTTP/2 client for all tool calls, so concurrent requests to wttr.in share a pooled connection
+http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    http2=True,
+)
+
+# City names are URL-encoded so names like "São Paulo" or "Cairo (Egypt)" form a valid path
+WTTR_URL = "https://wttr.in/{}?format=j1"
+
+# Keep each city's weather on disk for 10 minutes so re-running the script skips the HTTP calls
+weather_cache = Cache(".weather_cache")
+
+# The wttr.in current_condition fields that map straight onto WeatherCondition, read in one call
+wttr_fields = itemgetter("temp_F", "temp_C", "FeelsLikeF", "humidity", "windspeedMiles", "winddir16Point")
+
+# Used for a city whose weather could not be fetched; read-only so it can be built once
+FALLBACK_WEATHER = MappingProxyType(
+    {
+        "temp_f": 0,
+        "temp_c": 0,
+        "feels_like_f": 0,
+        "condition": "Unable to fetch",
+        "humidity": 0,
+        "wind_speed_mph": 0,
+        "wind_dir": "N/A",
+    }
+)
 
 
 # Structured weather data models
@@ -47,6 +100,30 @@ class WeatherCondition(BaseModel):
     wind_speed_mph: int = Field(description="Wind speed in MPH")
     wind_dir: str = Field(description="Wind direction")
 
+    @model_validator(mode="before")
+    @classmethod
+    def from_wttr(cls, data: Any, info: ValidationInfo) -> Any:
+        """Flatten a raw wttr.in j1 payload; the agent's own output passes through unchanged."""
+        if isinstance(data, dict) and "current_condition" in data:
+            # Pydantic only wraps ValueError, so report a malformed payload as one instead of a bare lookup error
+            try:
+                current = data["current_condition"][0]
+                temp_f, temp_c, feels_like_f, humidity, wind_speed_mph, wind_dir = wttr_fields(current)
+                condition = current["weatherDesc"][0]["value"]
+            except (KeyError, IndexError, TypeError) as e:
+                raise ValueError(f"Unexpected wttr.in payload: {e!r}") from e
+            return {
+                "city": info.context["city"],
+                "temp_f": temp_f,
+                "temp_c": temp_c,
+                "feels_like_f": feels_like_f,
+                "condition": condition,
+                "humidity": humidity,
+                "wind_speed_mph": wind_speed_mph,
+                "wind_dir": wind_dir,
+            }
+        return data
+
 
 class WeatherReport(BaseModel):
     """Multiple city weather report"""
@@ -54,6 +131,14 @@ class WeatherReport(BaseModel):
     cities: list[WeatherCondition] = Field(description="Weather data for multiple cities")
 
 
+# Request latency-optimized inference on Bedrock; the Bedrock settings import boto3, so only load them there
+if model and model.startswith("bedrock:"):
+    from pydantic_ai.models.bedrock import BedrockModelSettings
+
+    model_settings = BedrockModelSettings(bedrock_performance_configuration={"latency": "optimized"})
+else:
+    model_settings = None
+
 # Create a weather agent with structured output
 agent = Agent[None, WeatherReport](
     model,
@@ -61,55 +146,72 @@ agent = Agent[None, WeatherReport](
     system_prompt=dedent(
         """
         You're a global weather assistant that fetches real-time weather data for multiple cities.
-        When asked about weather, use the get_weather tool to fetch data for major cities around the world.
+        When asked about weather, call get_weather ONCE with the full list of cities.
         Return structured data for all cities in the WeatherReport format.
         """
     ).strip(),
+    model_settings=model_settings,
     instrument=True,
 )
 
 
+async def fetch_weather(city: str) -> WeatherCondition:
+    """Fetch real weather data from wttr.in API for a single city."""
+    cache_key = city.casefold().strip()
+    if (cached := weather_cache.get(cache_key)) is not None:
+        log.info("Weather cache hit", city=city)
+        return cached
+
+    url = WTTR_URL.format(quote(city, safe=""))
+    log.info("Fetching weather", city=city, url=url)
+
+    # Only the network call and parsing are expected to fail (pydantic.ValidationError is a ValueError)
+    try:
+        response = await http_client.get(url)
+        response.raise_for_status()
+        # Parse the JSON and convert the numeric strings in one pass in pydantic-core
+        weather = WeatherCondition.model_validate_json(response.content, context={"city": city})
+    except (httpx.HTTPError, ValueError) as e:
+        log.error("Weather fetch failed", city=city, error=str(e))
+        return WeatherCondition.model_construct(city=city, **FALLBACK_WEATHER)
+
+    log.info("Weather retrieved", city=city, temp_f=weather.temp_f)
+    weather_cache.set(cache_key, weather, expire=600)
+    return weather
+
+
 @agent.tool_plain
-def get_weather(city: str) -> dict[str, str | int]:
-    """Fetch real weather data from wttr.in API for a specific city."""
+async def get_weather(cities: list[str]) -> list[WeatherCondition]:
+    """Fetch real weather data from wttr.in API for a list of cities at once."""
+    return await asyncio.gather(*(fetch_weather(city) for city in cities))
+
+
+async def warm_up_connection():
+    """Open a connection to wttr.in while the model is still planning its first tool call."""
     try:
-        url = f"https://wttr.in/{city}?format=j1"
-        logfire.info("Fetching weather", city=city, url=url)
-
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-        # Extract current conditions
-        current = data["current_condition"][0]
-
-        weather_data = {
-            "city": city,
-            "temp_f": int(current["temp_F"]),
-            "temp_c": int(current["temp_C"]),
-            "feels_like_f": int(current["FeelsLikeF"]),
-            "condition": current["weatherDesc"][0]["value"],
-            "humidity": int(current["humidity"]),
-            "wind_speed_mph": int(current["windspeedMiles"]),
-            "wind_dir": current["winddir16Point"],
-        }
-
-        logfire.info("Weather retrieved", city=city, temp_f=weather_data["temp_f"])
-        return weather_data
-
-    except Exception as e:
-        logfire.error("Weather fetch failed", city=city, error=str(e))
-        return {
-            "city": city,
-            "temp_f": 0,
-            "temp_c": 0,
-            "feels_like_f": 0,
-            "condition": "Unable to fetch",
-            "humidity": 0,
-            "wind_speed_mph": 0,
-            "wind_dir": "N/A",
-        }
+        await http_client.head("https://wttr.in/", timeout=5.0)
+    except httpx.HTTPError:
+        pass  # Only an optimization; fetch_weather reports real connection problems
+
+
+WEATHER_PROMPT = dedent(
+    """
+    Get the current weather for these locations around the world:
+    New York, London, Tokyo, Sydney, Paris, Dubai, São Paulo, Cairo (Egypt),
+    Beijing (China), Moscow (Russia), Portland (Oregon), Mexico City, and
+    McMurdo Station (Antarctica).
+    Fetch weather for all of them.
+    """
+).strip()
+
+
+async def main() -> WeatherReport:
+    # Close the shared client once the agent run is finished
+    async with http_client:
+        warm_up = asyncio.create_task(warm_up_connection())
+        result = await agent.run(WEATHER_PROMPT)
+        await warm_up
+    return result.output
 
 
 # Run the agent
@@ -117,19 +219,7 @@ print("🌍 Real-Time Global Weather Monitor")
 print("=" * 70)
 print()
 
-result = agent.run_sync(
-    dedent(
-        """
-        Get the current weather for these locations around the world:
-        New York, London, Tokyo, Sydney, Paris, Dubai, São Paulo, Cairo (Egypt),
-        Beijing (China), Moscow (Russia), Portland (Oregon), Mexico City, and
-        McMurdo Station (Antarctica).
-        Fetch weather for all of them.
-        """
-    ).strip()
-)
-
-weather_report = result.output
+weather_report = asyncio.run(main())
 
 # Create Rich table for display
 console = Console()
@@ -142,15 +232,21 @@ table.add_column("Condition", style="green")
 table.add_column("Humidity", justify="right", style="blue")
 table.add_column("Wind", justify="right", style="cyan")
 
-# Add rows for each city
-for city_weather in weather_report.cities:
+# Cell formats, bound once and reused for every row
+format_temp = "{}°F".format
+format_humidity = "{}%".format
+format_wind = "{} mph {}".format
+
+# Add rows for each city, pulling all displayed fields out of each model in one call
+row_fields = attrgetter("city", "temp_f", "feels_like_f", "condition", "humidity", "wind_speed_mph", "wind_dir")
+for city, temp_f, feels_like_f, condition, humidity, wind_speed_mph, wind_dir in map(row_fields, weather_report.cities):
     table.add_row(
-        city_weather.city,
-        f"{city_weather.temp_f}°F",
-        f"{city_weather.feels_like_f}°F",
-        city_weather.condition,
-        f"{city_weather.humidity}%",
-        f"{city_weather.wind_speed_mph} mph {city_weather.wind_dir}",
+        city,
+        format_temp(temp_f),
+        format_temp(feels_like_f),
+        condition,
+        format_humidity(humidity),
+        format_wind(wind_speed_mph, wind_dir),
     )
 
 print()
@@ -158,5 +254,6 @@ console.print(table)
 print()
 print("=" * 70)
 print("✅ Weather data sourced from wttr.in")
-print("✅ Check Logfire output above for traced operations")
+if logfire_enabled:
+    print("✅ Check Logfire output above for traced operations")
 print(f"✅ Retrieved data for {len(weather_report.cities)} cities")
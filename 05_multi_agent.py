@@ -15,11 +15,12 @@ Demonstrates agent composition where a coordinator delegates to specialized sub-
 The research agent (Claude Haiku 4.5) searches the web using DuckDuckGo for current information,
 while the writing agent (OpenAI o4-mini) transforms that information into engaging content.
 Shows how different models can be used for different specialized tasks.
+Sub-agents are awaited from async tools, so several research runs can happen in parallel.
 """
 
+import asyncio
 import os
 
-import logfire
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
@@ -32,8 +33,23 @@ console = Console()
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+logfire_enabled = os.getenv("LOGFIRE_ENABLED") == "1"
+if logfire_enabled:
+    import logfire
+
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
+    log = logfire
+else:
+
+    class NoLog:
+        """Stand-in for logfire that ignores every logging call."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    log = NoLog()
 
 
 class Article(BaseModel):
@@ -58,37 +74,51 @@ writing_agent = Agent(
 coordinator = Agent[None, Article](
     "anthropic:claude-haiku-4-5",
     output_type=Article,
-    system_prompt="You're a coordinator that delegates tasks to specialist agents. Use research_topic to gather information, then write_content to create the article. Return the final article content in the Article format.",
+    system_prompt="You're a coordinator that delegates tasks to specialist agents. Use research_topic to gather information, or research_topics to research several subtopics at once, then write_content to create the article. Return the final article content in the Article format.",
     instrument=True,
 )
 
+# Prompts sent to the sub-agents, kept in one place so they are easy to read and adjust
+RESEARCH_PROMPT = "Provide key facts about: {topic}"
+WRITING_PROMPT = "Write {style} prose based on this information: {information}"
+
 
 # Tool that calls the research agent
 @coordinator.tool_plain
-def research_topic(topic: str) -> str:
+async def research_topic(topic: str) -> str:
     """Research a topic using the specialized research agent."""
-    logfire.info(f"Research agent investigating: {topic}")
-    result = research_agent.run_sync(f"Provide key facts about: {topic}")
+    log.info("Research agent investigating: {topic}", topic=topic)
+    result = await research_agent.run(RESEARCH_PROMPT.format(topic=topic))
     return result.output
 
 
+# Tool that fans out several research agent runs at once
+@coordinator.tool_plain
+async def research_topics(topics: list[str]) -> list[str]:
+    """Research several subtopics in parallel using the specialized research agent."""
+    return await asyncio.gather(*(research_topic(topic) for topic in topics))
+
+
 # Tool that calls the writing agent
 @coordinator.tool_plain
-def write_content(information: str, style: str = "engaging") -> str:
+async def write_content(information: str, style: str = "engaging") -> str:
     """Write content using the specialized writing agent."""
-    logfire.info(f"Writing agent creating {style} content")
-    result = writing_agent.run_sync(f"Write {style} prose based on this information: {information}")
+    log.info("Writing agent creating {style} content", style=style)
+    result = await writing_agent.run(WRITING_PROMPT.format(style=style, information=information))
     return result.output
 
 
-console.print("\n[bold cyan]Multi-agent demo[/bold cyan]\n")
+async def main() -> Article:
+    log.info("Starting multi-agent workflow")
+    result = await coordinator.run(
+        "I need an engaging article about quantum computing. First research it, then write compelling prose content."
+    )
+    return result.output
 
-logfire.info("Starting multi-agent workflow")
-result = coordinator.run_sync(
-    "I need an engaging article about quantum computing. First research it, then write compelling prose content."
-)
 
-article = result.output
+console.print("\n[bold cyan]Multi-agent demo[/bold cyan]\n")
+
+article = asyncio.run(main())
 
 console.print(Panel(Markdown(article.content), title="Article", border_style="cyan"))
 console.print()
@@ -5,6 +5,7 @@
 #   "pydantic-ai==1.1.0",
 #   "python-dotenv==1.1.1",
 #   "mcp==1.17.0",
+#   "diskcache==5.6.3",
 #   "rich==14.2.0",
 # ]
 # ///
@@ -12,36 +13,144 @@
 MCP Server Integration
 
 Demonstrates connecting to an MCP server for Kubernetes and letting the agent use the tools.
+The MCP server process is started once and kept running, so follow-up questions reuse it
+instead of paying the pnpx startup cost again. Read-only resource lookups are cached on disk
+for five minutes, while logs, events, metrics and Secrets are always fetched fresh.
+Any tool that changes the cluster clears the cache.
 """
 
+import asyncio
+import json
 import os
+import shutil
+import subprocess
+from textwrap import dedent
 
-import logfire
+from diskcache import Cache
 from dotenv import load_dotenv
 from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStdio
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.prompt import Prompt
 
 console = Console()
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+if os.getenv("LOGFIRE_ENABLED") == "1":
+    import logfire
 
-kubernetes_mcp_server = MCPServerStdio("pnpx", args=["kubernetes-mcp-server@0.0.53"], timeout=30)
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
+
+# Launch an installed kubernetes-mcp-server binary directly (pnpm add -g kubernetes-mcp-server@0.0.53) when it is
+# the pinned version; otherwise fall back to pnpx, which has to resolve the package and boot Node before the server starts
+MCP_SERVER_VERSION = "0.0.53"
+
+
+def installed_server_version(server_path):
+    """Ask the installed binary for its version, or return None if it can't tell us."""
+    try:
+        result = subprocess.run([server_path, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+server_path = shutil.which("kubernetes-mcp-server")
+if server_path and MCP_SERVER_VERSION in (installed_server_version(server_path) or ""):
+    command, args = server_path, []
+else:
+    command, args = "pnpx", [f"kubernetes-mcp-server@{MCP_SERVER_VERSION}"]
+
+# Keep read-only cluster lookups on disk for 5 minutes so re-running the demo doesn't query the cluster again.
+# Logs, events and live metrics change too quickly to reuse, so they are always fetched fresh,
+# and Secrets are never written to disk.
+mcp_cache = Cache(".mcp_cache")
+READ_ONLY_TOOL_SUFFIXES = ("_list", "_get", "_view")
+UNCACHED_TOOLS = ("events_list",)
+UNCACHED_TOOL_SUFFIXES = ("_log", "_top")
+UNCACHED_KINDS = ("Secret",)
+
+
+def current_kube_context():
+    """Read current-context from the active kubeconfig, so each cluster gets its own cache entries."""
+    kubeconfig = os.getenv("KUBECONFIG", "").split(os.pathsep)[0] or os.path.expanduser("~/.kube/config")
+    try:
+        with open(kubeconfig) as f:
+            for line in f:
+                if line.startswith("current-context:"):
+                    return line.partition(":")[2].strip().strip("\"'")
+    except OSError:
+        pass
+    return None
+
+
+async def cached_tool_call(ctx, call_tool, name, tool_args):
+    """Serve repeated read-only MCP tool calls from the cache; anything that changes the cluster clears it."""
+    if not name.endswith(READ_ONLY_TOOL_SUFFIXES):
+        result = await call_tool(name, tool_args, None)
+        # The cluster may have changed, so earlier lookups can no longer be trusted
+        mcp_cache.clear()
+        return result
+
+    if name in UNCACHED_TOOLS or name.endswith(UNCACHED_TOOL_SUFFIXES) or tool_args.get("kind") in UNCACHED_KINDS:
+        return await call_tool(name, tool_args, None)
+
+    cache_key = json.dumps([current_kube_context(), name, tool_args], sort_keys=True)
+    if (cached := mcp_cache.get(cache_key)) is not None:
+        return cached
+
+    result = await call_tool(name, tool_args, None)
+    mcp_cache.set(cache_key, result, expire=300)
+    return result
+
+
+kubernetes_mcp_server = MCPServerStdio(command, args=args, timeout=30, process_tool_call=cached_tool_call)
 
 agent = Agent(
     model,
     toolsets=[kubernetes_mcp_server],
-    system_prompt="You're a Kubernetes monitoring assistant. Check deployment status and report findings in clear, formatted text. Be persistent and thorough.",
+    system_prompt=dedent(
+        """
+        You're a Kubernetes monitoring assistant. Check deployment status and report findings in clear, formatted text.
+        Be persistent and thorough.
+        Prefer list tools with a label selector, so a single call covers all matching deployments and pods,
+        over fetching each resource one at a time.
+        """
+    ).strip(),
 )
 
-console.print("\n[bold cyan]Kubernetes investigation with MCP[/bold cyan]\n")
 
-result = agent.run_sync("Check the status of ai-data-collector")
+async def main():
+    console.print("\n[bold cyan]Kubernetes investigation with MCP[/bold cyan]")
+    console.print(f"[dim]MCP server: {' '.join([command, *args])}[/dim]")
+    console.print("[dim]Resource lookups are cached, so results may be up to 5 minutes old[/dim]\n")
+
+    # Entering the agent starts the MCP server once; it stays up until the block exits
+    async with agent:
+        result = await agent.run("Check the status of ai-data-collector")
+        console.print(Panel(Markdown(result.output), title="Deployment Status", border_style="cyan"))
+        message_history = result.all_messages()
+
+        # Follow-up questions reuse the running server
+        while True:
+            user_input = Prompt.ask("\n[bold blue]Follow-up[/bold blue] (or 'exit')")
+
+            if user_input.lower() in ["exit", "quit", "done"]:
+                break
+
+            result = await agent.run(user_input, message_history=message_history)
+            console.print(Panel(Markdown(result.output), title="Assistant", border_style="cyan"))
+            message_history = result.all_messages()
+
+    console.print()
+
 
-console.print(Panel(Markdown(result.output), title="Deployment Status", border_style="cyan"))
-console.print()
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    console.print("\n[yellow]Goodbye![/yellow]")
@@ -13,15 +13,17 @@ Conversation History
 Demonstrates multi-turn conversations by passing message_history between agent runs.
 Shows how agents maintain context across multiple interactions. The agent asks
 questions to gather travel preferences and remembers details throughout.
+Replies are streamed, so each answer appears as it is generated.
 """
 
+import asyncio
 import os
 from textwrap import dedent
 
-import logfire
 from dotenv import load_dotenv
 from pydantic_ai import Agent
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -30,8 +32,12 @@ console = Console()
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+if os.getenv("LOGFIRE_ENABLED") == "1":
+    import logfire
+
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
 
 agent = Agent(
     model,
@@ -43,25 +49,36 @@ agent = Agent(
     ).strip(),
 )
 
-console.print("\n[bold cyan]Travel Planning Assistant[/bold cyan]\n")
 
-# Start the conversation - let the agent initiate
-result = agent.run_sync("Start helping me plan a trip.")
-console.print(Panel(Markdown(result.output), title="Assistant", border_style="green"))
+async def reply(user_input: str, message_history: list) -> None:
+    """Stream the agent's reply into a live panel and append the turn to the history."""
+    async with agent.run_stream(user_input, message_history=message_history) as result:
+        with Live(console=console, vertical_overflow="visible") as live:
+            async for text in result.stream_text():
+                live.update(Panel(Markdown(text), title="Assistant", border_style="green"))
+    message_history.extend(result.new_messages())
 
-message_history = result.new_messages()
 
-# Interactive conversation loop
-try:
+async def main():
+    console.print("\n[bold cyan]Travel Planning Assistant[/bold cyan]\n")
+
+    # Every turn's messages are appended here, so each run sees the whole conversation so far
+    message_history = []
+
+    # Start the conversation - let the agent initiate
+    await reply("Start helping me plan a trip.", message_history)
+
+    # Interactive conversation loop
     while True:
         user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
 
         if user_input.lower() in ["exit", "quit", "done"]:
             break
 
-        result = agent.run_sync(user_input, message_history=message_history)
-        console.print(Panel(Markdown(result.output), title="Assistant", border_style="green"))
+        await reply(user_input, message_history)
+
 
-        message_history = result.new_messages()
+try:
+    asyncio.run(main())
 except KeyboardInterrupt:
     console.print("\n[yellow]Goodbye![/yellow]")
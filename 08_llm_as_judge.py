@@ -4,6 +4,7 @@
 # dependencies = [
 #   "pydantic-ai==1.1.0",
 #   "python-dotenv==1.1.1",
+#   "emoji==2.16.0",
 #   "rich==14.2.0",
 # ]
 # ///
@@ -13,12 +14,16 @@ LLM as Judge with Output Validator
 Demonstrates using a smaller, faster LLM (Haiku) as a judge to validate outputs
 from another agent. The judge enforces criteria and provides feedback for automatic
 retries. Shows the output_validator pattern combined with LLM-as-judge.
+Emojis and hashtags are counted locally first, so drafts that obviously fall short
+are sent back without a judge call.
 """
 
+import asyncio
 import os
+import re
 from textwrap import dedent
 
-import logfire
+import emoji
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, ModelRetry
@@ -30,8 +35,23 @@ console = Console()
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+logfire_enabled = os.getenv("LOGFIRE_ENABLED") == "1"
+if logfire_enabled:
+    import logfire
+
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
+    log = logfire
+else:
+
+    class NoLog:
+        """Stand-in for logfire that ignores every logging call."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    log = NoLog()
 
 
 class LinkedInJudgment(BaseModel):
@@ -62,6 +82,9 @@ judge_agent = Agent[None, LinkedInJudgment](
     instrument=True,
 )
 
+# Hashtags are counted locally; humble brags and superlatives need the judge's reading of the text
+HASHTAG_RE = re.compile(r"#\w+")
+
 # Main writer agent
 writer_agent = Agent(
     model,
@@ -72,23 +95,42 @@ writer_agent = Agent(
 
 
 @writer_agent.output_validator
-def validate_with_judge(post: str) -> str:
+async def validate_with_judge(post: str) -> str:
     """Use LLM judge to validate the post meets LinkedIn standards."""
 
-    logfire.info("Calling judge agent to evaluate post")
-
     # Show the post being judged
     console.print(Panel(Markdown(post), title="Draft Post", border_style="blue"))
 
+    # Emojis and hashtags can be counted exactly, so skip the judge call when they already fall short
+    emoji_count = emoji.emoji_count(post)
+    hashtag_count = len(HASHTAG_RE.findall(post))
+    if emoji_count < 10 or hashtag_count < 30:
+        feedback = f"Needs at least 10 emojis (found {emoji_count}) and at least 30 hashtags (found {hashtag_count})."
+        log.info("Local check rejected post", emoji_count=emoji_count, hashtag_count=hashtag_count)
+        console.print(
+            Panel(
+                Markdown(f"**Status:** ❌ REJECTED\n\n**Feedback:** {feedback}"),
+                title="Local Check",
+                border_style="red",
+            )
+        )
+        raise ModelRetry(f"Post rejected. {feedback}")
+
+    log.info("Calling judge agent to evaluate post")
+
     # Call the judge agent to evaluate
-    judge_result = judge_agent.run_sync(f"Evaluate this LinkedIn post:\n\n{post}")
+    judge_result = await judge_agent.run(f"Evaluate this LinkedIn post:\n\n{post}")
     judgment = judge_result.output
 
     # Log the judgment
-    logfire.info(
-        f"Judge verdict: approved={judgment.approved}, emojis={judgment.emoji_count}, "
-        f"humble_brags={judgment.humble_brag_count}, superlatives={judgment.superlatives_count}, "
-        f"hashtags={judgment.hashtag_count}"
+    log.info(
+        "Judge verdict: approved={approved}, emojis={emojis}, humble_brags={humble_brags}, "
+        "superlatives={superlatives}, hashtags={hashtags}",
+        approved=judgment.approved,
+        emojis=judgment.emoji_count,
+        humble_brags=judgment.humble_brag_count,
+        superlatives=judgment.superlatives_count,
+        hashtags=judgment.hashtag_count,
     )
 
     # Display judgment in console
@@ -118,13 +160,17 @@ def validate_with_judge(post: str) -> str:
     if not judgment.approved:
         raise ModelRetry(f"Post rejected. {judgment.feedback}")
 
-    logfire.info("Post approved by judge")
+    log.info("Post approved by judge")
     return post
 
 
+async def main():
+    return await writer_agent.run("Write a simple, understated post about getting promoted to mid-level engineer")
+
+
 console.print("\n[bold cyan]LinkedIn Post with LLM Judge Validation[/bold cyan]\n")
 
-result = writer_agent.run_sync("Write a simple, understated post about getting promoted to mid-level engineer")
+result = asyncio.run(main())
 post = result.output
 
 console.print(Panel(Markdown(post), title="Final Approved Post", border_style="green"))
@@ -12,16 +12,19 @@ Human-in-the-Loop Negotiation
 
 Demonstrates multi-agent negotiation with human approval. Your AI negotiator works
 with you to buy goats from an unpredictable seller. Type 'buy' to seal the deal,
-or provide feedback for your agent to continue negotiating.
+or provide feedback for your agent to continue negotiating. Each agent's reply is
+streamed into its panel as it is generated.
 """
 
+import asyncio
 import os
+from collections import deque
 from textwrap import dedent
 
-import logfire
 from dotenv import load_dotenv
 from pydantic_ai import Agent
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -30,8 +33,23 @@ console = Console()
 
 load_dotenv(override=True)
 model = os.getenv("MODEL")
-logfire.configure(send_to_logfire=False)
-logfire.instrument_pydantic_ai()
+# Logfire noticeably slows down startup, so only load it when LOGFIRE_ENABLED=1
+logfire_enabled = os.getenv("LOGFIRE_ENABLED") == "1"
+if logfire_enabled:
+    import logfire
+
+    logfire.configure(send_to_logfire=False)
+    logfire.instrument_pydantic_ai()
+    log = logfire
+else:
+
+    class NoLog:
+        """Stand-in for logfire that ignores every logging call."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    log = NoLog()
 
 # Unpredictable seller agent
 seller_agent = Agent(
@@ -78,90 +96,110 @@ negotiator_agent = Agent(
     instrument=True,
 )
 
-console.print("\n[bold cyan]🐐 Goat Negotiation Simulator[/bold cyan]\n")
-console.print("[dim]Type 'buy' to accept a deal, or give feedback to continue negotiating[/dim]\n")
-
-logfire.info("Starting negotiation")
 
-# Get seller's opening offer
-seller_response = seller_agent.run_sync("Make your opening pitch to sell your goats.")
+def format_history(opening_pitch: str, recent_turns: deque[tuple[str, str]]) -> str:
+    """Render the opening pitch and the recent turns as a transcript for the agents' prompts."""
+    turns = [("Seller (opening pitch)", opening_pitch), *recent_turns]
+    return "\n\n".join(f"{speaker}: {text}" for speaker, text in turns)
 
-console.print(Panel(Markdown(seller_response.output), title="Seller's Opening Pitch", border_style="red"))
 
-conversation_history = f"Seller said: {seller_response.output}"
+async def stream_reply(agent: Agent, prompt: str, title: str, border_style: str) -> str:
+    """Stream an agent's reply into a live panel and return the finished text."""
+    async with agent.run_stream(prompt) as result:
+        with Live(console=console, vertical_overflow="visible") as live:
+            async for text in result.stream_text():
+                live.update(Panel(Markdown(text), title=title, border_style=border_style))
+        return await result.get_output()
 
-while True:
-    # Our agent analyzes and presents to us
-    logfire.info("Negotiator preparing proposal")
 
-    negotiator_response = negotiator_agent.run_sync(
-        dedent(
-            f"""
-            Here's the conversation so far:
+async def main():
+    console.print("\n[bold cyan]🐐 Goat Negotiation Simulator[/bold cyan]\n")
+    console.print("[dim]Type 'buy' to accept a deal, or give feedback to continue negotiating[/dim]\n")
 
-            {conversation_history}
+    log.info("Starting negotiation")
 
-            Present the current situation to your client and recommend next steps.
-            """
-        ).strip()
+    # Get seller's opening offer
+    opening_pitch = await stream_reply(
+        seller_agent, "Make your opening pitch to sell your goats.", "Seller's Opening Pitch", "red"
     )
 
-    console.print(Panel(Markdown(negotiator_response.output), title="Your Negotiator", border_style="blue"))
-
-    # Get human input
-    user_input = Prompt.ask("\n[bold green]Your decision[/bold green]").strip()
+    # Only the most recent turns are sent back to the agents, so prompts stay bounded as the haggling drags on;
+    # the opening pitch is kept separately so the herd size and starting price are never forgotten
+    conversation_history = deque(maxlen=8)
 
-    if user_input.lower() == "buy":
-        console.print("\n[bold green]🤝 Deal sealed![/bold green]\n")
-        logfire.info("Deal accepted by human")
-        break
+    while True:
+        # Our agent analyzes and presents to us
+        log.info("Negotiator preparing proposal")
 
-    # User gave feedback - negotiate more rounds
-    logfire.info(f"Human feedback: {user_input}")
-    console.print()
-
-    # Agent takes feedback and negotiates with seller
-    for round_num in range(3):  # Up to 3 rounds of back-and-forth
-        logfire.info(f"Negotiation round {round_num + 1}")
-
-        negotiator_response = negotiator_agent.run_sync(
+        await stream_reply(
+            negotiator_agent,
             dedent(
                 f"""
-                Previous conversation:
-                {conversation_history}
+                Here's the conversation so far:
 
-                Your client said: "{user_input}"
+                {format_history(opening_pitch, conversation_history)}
 
-                Respond to the seller based on your client's feedback. Be natural and conversational.
+                Present the current situation to your client and recommend next steps.
                 """
-            ).strip()
+            ).strip(),
+            "Your Negotiator",
+            "blue",
         )
-        console.print(
-            Panel(
-                Markdown(negotiator_response.output), title=f"Negotiator (Round {round_num + 1})", border_style="blue"
+
+        # Get human input
+        user_input = Prompt.ask("\n[bold green]Your decision[/bold green]").strip()
+
+        if user_input.lower() == "buy":
+            console.print("\n[bold green]🤝 Deal sealed![/bold green]\n")
+            log.info("Deal accepted by human")
+            break
+
+        # User gave feedback - negotiate more rounds
+        log.info("Human feedback: {feedback}", feedback=user_input)
+        console.print()
+
+        # Agent takes feedback and negotiates with seller
+        for round_num in range(3):  # Up to 3 rounds of back-and-forth
+            log.info("Negotiation round {round}", round=round_num + 1)
+
+            negotiator_reply = await stream_reply(
+                negotiator_agent,
+                dedent(
+                    f"""
+                    Previous conversation:
+                    {format_history(opening_pitch, conversation_history)}
+
+                    Your client said: "{user_input}"
+
+                    Respond to the seller based on your client's feedback. Be natural and conversational.
+                    """
+                ).strip(),
+                f"Negotiator (Round {round_num + 1})",
+                "blue",
             )
-        )
 
-        conversation_history += f"\n\nYou: {negotiator_response.output}"
+            conversation_history.append(("You", negotiator_reply))
 
-        # Seller responds
-        seller_response = seller_agent.run_sync(
-            dedent(
-                f"""
-                Previous conversation:
-                {conversation_history}
+            # Seller responds
+            seller_reply = await stream_reply(
+                seller_agent,
+                dedent(
+                    f"""
+                    Previous conversation:
+                    {format_history(opening_pitch, conversation_history)}
 
-                The buyer said: {negotiator_response.output}
+                    The buyer said: {negotiator_reply}
 
-                Respond to their offer or counteroffer.
-                """
-            ).strip()
-        )
+                    Respond to their offer or counteroffer.
+                    """
+                ).strip(),
+                f"Seller (Round {round_num + 1})",
+                "red",
+            )
 
-        console.print(
-            Panel(Markdown(seller_response.output), title=f"Seller (Round {round_num + 1})", border_style="red")
-        )
+            conversation_history.append(("Seller", seller_reply))
+
+        console.print()
 
-        conversation_history += f"\n\nSeller: {seller_response.output}"
 
-    console.print()
+asyncio.run(main())